@@ -0,0 +1,320 @@
+"""Benchmark reproducible de todos los endpoints.
+
+Levanta la aplicación contra una base SQLite local, la llena con datos sintéticos a la
+escala pedida y ejecuta una carga mixta según el rol (clientes, agentes y administradores).
+Imprime un JSON con p50/p95/p99, peticiones por segundo y consultas SQL por petición para
+cada operación, que puede guardarse y compararse entre commits con benchmarks/comparar.py.
+
+Uso:
+    python -m benchmarks.carga --reservaciones 10000 --peticiones 2000 --salida base.json
+    python -m benchmarks.carga --reservaciones 1000000 --peticiones 5000 --hilos 4
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reservaciones', type=int, default=10_000, help="filas de reservación a generar")
+    parser.add_argument('--cotizaciones', type=int, default=None, help="filas de cotización (por defecto, igual a --reservaciones)")
+    parser.add_argument('--usuarios', type=int, default=None, help="usuarios a generar (por defecto, reservaciones / 100, mínimo 50)")
+    parser.add_argument('--peticiones', type=int, default=2000, help="peticiones totales de la carga")
+    parser.add_argument('--hilos', type=int, default=1, help="hilos concurrentes que envían peticiones")
+    parser.add_argument('--semilla', type=int, default=42, help="semilla para que la carga sea reproducible")
+    parser.add_argument('--bcrypt-rounds', type=int, default=12, help="costo de bcrypt usado en login y alta de usuarios")
+    parser.add_argument('--base-datos', default=None, help="URL de SQLAlchemy; por defecto un archivo SQLite temporal")
+    parser.add_argument('--salida', default=None, help="archivo donde guardar el JSON (por defecto, la salida estándar)")
+    args = parser.parse_args(argv)
+    if args.cotizaciones is None:
+        args.cotizaciones = args.reservaciones
+    if args.usuarios is None:
+        args.usuarios = max(50, args.reservaciones // 100)
+    return args
+
+# --- Datos sintéticos ---
+
+CONTRASENA = "benchmark"
+LOTE_INSERCION = 10_000
+
+def poblar(app, db, modelos, args, rng):
+    Usuario, Proveedor, Cotizacion, Reservacion, Rol, EstadoCotizacion, EstadoReservacion, TipoProveedor = modelos
+    with app.app_context():
+        # Un solo hash para todos los usuarios: generar uno por fila a costo 12 tomaría horas a gran escala
+        plantilla = Usuario()
+        plantilla.set_password(CONTRASENA)
+        hoy = date.today()
+
+        usuarios = []
+        for i in range(1, args.usuarios + 1):
+            rol = Rol.Administrador if i == 1 else Rol.Agente if i <= 5 else Rol.Cliente
+            usuarios.append({"id": i, "nombre": f"Usuario {i}", "cedula": f"{i:09d}", "correo_electronico": f"usuario{i}@bench.local",
+                             "hash_contrasena": plantilla.hash_contrasena, "rol": rol, "fecha_creacion": hoy, "fecha_actualizacion": hoy})
+        insertar(db, Usuario, usuarios)
+
+        tipos = list(TipoProveedor)
+        insertar(db, Proveedor, [
+            {"nombre": f"Proveedor {i}", "tipo": tipos[i % len(tipos)], "enlace": f"https://proveedor{i}.example.com",
+             "fecha_creacion": hoy, "fecha_actualizacion": hoy} for i in range(200)])
+
+        estados_c = list(EstadoCotizacion)
+        insertar(db, Cotizacion, (
+            {"servicio": f"Servicio {i % 50}", "detalle": f"Detalle de la cotización {i}", "estado": estados_c[i % len(estados_c)],
+             "id_usuario": rng.randint(1, args.usuarios), "fecha_creacion": hoy - timedelta(days=i % 700),
+             "fecha_actualizacion": hoy} for i in range(args.cotizaciones)))
+
+        estados_r = list(EstadoReservacion)
+        inicio_base = hoy - timedelta(days=365)
+
+        def reservacion(i):
+            inicio = inicio_base + timedelta(days=rng.randint(0, 730))
+            return {"fecha_inicio": inicio, "fecha_fin": inicio + timedelta(days=rng.randint(1, 14)),
+                    "detalle": f"Reservación {i}", "estado": estados_r[i % len(estados_r)],
+                    "id_usuario": rng.randint(1, args.usuarios), "fecha_creacion": hoy, "fecha_actualizacion": hoy}
+        insertar(db, Reservacion, (reservacion(i) for i in range(args.reservaciones)))
+
+def insertar(db, modelo, filas):
+    # Inserción por lotes con Core: varias veces más rápida que crear objetos del ORM
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) >= LOTE_INSERCION:
+            db.session.execute(db.insert(modelo), lote)
+            lote = []
+    if lote:
+        db.session.execute(db.insert(modelo), lote)
+    db.session.commit()
+
+# --- Carga de trabajo ---
+
+class Contexto:
+    """Estado compartido por las operaciones: tokens por rol y ids conocidos."""
+
+    def __init__(self, args, rng):
+        self.args = args
+        self.rng = rng
+        self.tokens = {}
+        self.secuencia = 0
+        self.lock = threading.Lock()
+
+    def siguiente(self):
+        with self.lock:
+            self.secuencia += 1
+            return self.secuencia
+
+    def cabeceras(self, rol):
+        return {"Authorization": "Bearer " + self.tokens[rol]}
+
+    def id_usuario_cliente(self):
+        return self.rng.randint(6, self.args.usuarios)
+
+    def id_reservacion(self):
+        return self.rng.randint(1, self.args.reservaciones)
+
+    def id_cotizacion(self):
+        return self.rng.randint(1, self.args.cotizaciones)
+
+    def fechas(self):
+        inicio = date.today() + timedelta(days=self.rng.randint(-300, 300))
+        return inicio.isoformat(), (inicio + timedelta(days=self.rng.randint(1, 10))).isoformat()
+
+def reservacion_nueva(ctx):
+    inicio, fin = ctx.fechas()
+    return {"fecha_inicio": inicio, "fecha_fin": fin, "detalle": "Benchmark", "id_usuario": ctx.id_usuario_cliente()}
+
+def cotizacion_nueva(ctx):
+    return {"servicio": "Benchmark", "detalle": "Detalle", "id_usuario": ctx.id_usuario_cliente()}
+
+# (nombre, peso, función). El peso refleja la proporción aproximada de tráfico real.
+OPERACIONES = [
+    ("POST /login", 3, lambda c, ctx: c.post("/login", json={"correo_electronico": f"usuario{ctx.id_usuario_cliente()}@bench.local", "contrasena": CONTRASENA})),
+    ("GET /reservaciones (cliente)", 20, lambda c, ctx: c.get("/reservaciones", headers=ctx.cabeceras("Cliente"))),
+    ("GET /reservaciones?limit=50 (agente)", 10, lambda c, ctx: c.get(f"/reservaciones?limit=50&after={ctx.id_reservacion()}", headers=ctx.cabeceras("Agente"))),
+    ("GET /reservaciones?estado&desde (agente)", 5, lambda c, ctx: c.get("/reservaciones?limit=50&estado=Confirmada&desde=" + ctx.fechas()[0], headers=ctx.cabeceras("Agente"))),
+    ("GET /reservaciones/solapamientos (agente)", 8, lambda c, ctx: c.get("/reservaciones/solapamientos?desde={}&hasta={}".format(*ctx.fechas()), headers=ctx.cabeceras("Agente"))),
+    ("GET /cotizaciones (cliente)", 15, lambda c, ctx: c.get("/cotizaciones", headers=ctx.cabeceras("Cliente"))),
+    ("GET /cotizaciones?limit=50 (agente)", 8, lambda c, ctx: c.get(f"/cotizaciones?limit=50&after={ctx.id_cotizacion()}", headers=ctx.cabeceras("Agente"))),
+    ("GET /proveedores (administrador)", 8, lambda c, ctx: c.get("/proveedores", headers=ctx.cabeceras("Administrador"))),
+    ("GET /proveedores/<id> (administrador)", 3, lambda c, ctx: c.get(f"/proveedores/{ctx.rng.randint(1, 200)}", headers=ctx.cabeceras("Administrador"))),
+    ("GET /usuarios?limit=50 (administrador)", 2, lambda c, ctx: c.get("/usuarios?limit=50", headers=ctx.cabeceras("Administrador"))),
+    ("POST /reservaciones (agente)", 5, lambda c, ctx: c.post("/reservaciones", json=reservacion_nueva(ctx), headers=ctx.cabeceras("Agente"))),
+    ("POST /reservaciones/bulk (agente)", 1, lambda c, ctx: c.post("/reservaciones/bulk", json={"items": [reservacion_nueva(ctx) for _ in range(50)]}, headers=ctx.cabeceras("Agente"))),
+    ("PUT /reservaciones/<id> (agente)", 3, lambda c, ctx: c.put(f"/reservaciones/{ctx.id_reservacion()}", json={**reservacion_nueva(ctx), "estado": "Confirmada"}, headers=ctx.cabeceras("Agente"))),
+    ("PATCH /reservaciones/<id> (agente)", 2, lambda c, ctx: c.patch(f"/reservaciones/{ctx.id_reservacion()}", json={"detalle": "Modificada"}, headers={**ctx.cabeceras("Agente"), "If-Match": "*"})),
+    ("POST /cotizaciones (cliente)", 4, lambda c, ctx: c.post("/cotizaciones", json=cotizacion_nueva(ctx), headers=ctx.cabeceras("Cliente"))),
+    ("POST /cotizaciones/bulk (agente)", 1, lambda c, ctx: c.post("/cotizaciones/bulk", json={"items": [cotizacion_nueva(ctx) for _ in range(50)]}, headers=ctx.cabeceras("Agente"))),
+    ("PUT /cotizaciones/<id> (agente)", 2, lambda c, ctx: c.put(f"/cotizaciones/{ctx.id_cotizacion()}", json={"servicio": "S", "detalle": "D", "estado": "Respondida"}, headers=ctx.cabeceras("Agente"))),
+    ("PATCH /cotizaciones/<id> (agente)", 2, lambda c, ctx: c.patch(f"/cotizaciones/{ctx.id_cotizacion()}", json={"estado": "Aceptada"}, headers={**ctx.cabeceras("Agente"), "If-Match": "*"})),
+    ("POST /proveedores (agente)", 1, lambda c, ctx: c.post("/proveedores", json={"nombre": "Nuevo", "enlace": "https://nuevo.example.com", "tipo": "Hotel"}, headers=ctx.cabeceras("Agente"))),
+    ("PUT /proveedores/<id> (agente)", 1, lambda c, ctx: c.put(f"/proveedores/{ctx.rng.randint(1, 200)}", json={"nombre": "Renombrado"}, headers=ctx.cabeceras("Agente"))),
+    ("POST /usuarios", 1, lambda c, ctx: c.post("/usuarios", json={"nombre": "Nuevo", "cedula": f"N{ctx.siguiente()}", "contrasena": CONTRASENA, "correo_electronico": f"nuevo{ctx.siguiente()}@bench.local", "rol": "Cliente"})),
+    ("PUT /usuarios/<id> (administrador)", 1, lambda c, ctx: c.put(f"/usuarios/{ctx.id_usuario_cliente()}", json={"nombre": "Renombrado"}, headers=ctx.cabeceras("Administrador"))),
+    ("GET /reservaciones/export (cliente)", 1, lambda c, ctx: c.get("/reservaciones/export", headers=ctx.cabeceras("Cliente"))),
+    ("GET /resumen?agrupar=estado,mes (administrador)", 2, lambda c, ctx: c.get("/resumen?agrupar=estado,mes", headers=ctx.cabeceras("Administrador"))),
+    ("GET /metrics", 1, lambda c, ctx: c.get("/metrics")),
+]
+
+# Operaciones que escriben una fila que después se borra, para cubrir los DELETE sin agotar los datos
+OPERACIONES_BORRADO = [
+    ("DELETE /reservaciones/<id> (agente)", "/reservaciones", "reservacion", reservacion_nueva, "Agente"),
+    ("DELETE /cotizaciones/<id> (agente)", "/cotizaciones", "cotizacion", cotizacion_nueva, "Agente"),
+]
+
+class ContadorConsultas:
+    """Cuenta las sentencias SQL ejecutadas por el hilo actual."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.local = threading.local()
+        event.listen(engine, "before_cursor_execute", self.contar)
+
+    def contar(self, *args):
+        self.local.n = getattr(self.local, "n", 0) + 1
+
+    def reiniciar(self):
+        self.local.n = 0
+
+    def valor(self):
+        return getattr(self.local, "n", 0)
+
+def medir(cliente, contador, funcion, ctx):
+    contador.reiniciar()
+    inicio = time.perf_counter()
+    respuesta = funcion(cliente, ctx)
+    respuesta.get_data()  # consume el cuerpo completo (incluye las respuestas en streaming)
+    return time.perf_counter() - inicio, contador.valor(), respuesta.status_code
+
+def ejecutar_carga(app, contador, ctx, args):
+    resultados = {}
+    lock = threading.Lock()
+    nombres = [o[0] for o in OPERACIONES]
+    pesos = [o[1] for o in OPERACIONES]
+    funciones = {o[0]: o[2] for o in OPERACIONES}
+    plan = ctx.rng.choices(nombres, weights=pesos, k=args.peticiones)
+    # Los DELETE se intercalan con una frecuencia fija sobre filas creadas para ese fin
+    plan += [o[0] for o in OPERACIONES_BORRADO] * max(1, args.peticiones // 100)
+    ctx.rng.shuffle(plan)
+
+    def registrar(nombre, duracion, consultas, estado):
+        with lock:
+            r = resultados.setdefault(nombre, {"duraciones": [], "consultas": [], "errores": 0})
+            r["duraciones"].append(duracion)
+            r["consultas"].append(consultas)
+            if estado >= 500:
+                r["errores"] += 1
+
+    def trabajador(porcion):
+        cliente = app.test_client()
+        for nombre in porcion:
+            if nombre in funciones:
+                registrar(nombre, *medir(cliente, contador, funciones[nombre], ctx))
+                continue
+            _, ruta, clave, generar, rol = next(o for o in OPERACIONES_BORRADO if o[0] == nombre)
+            creada = cliente.post(ruta, json=generar(ctx), headers=ctx.cabeceras(rol)).get_json()
+            id_creado = creada[clave]["id"]
+            registrar(nombre, *medir(cliente, contador, lambda c, ctx: c.delete(f"{ruta}/{id_creado}", headers=ctx.cabeceras(rol)), ctx))
+
+    inicio = time.perf_counter()
+    hilos = [threading.Thread(target=trabajador, args=(plan[i::args.hilos],)) for i in range(args.hilos)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    return resultados, time.perf_counter() - inicio
+
+def percentil(valores, p):
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method='inclusive')[p - 1]
+
+def resumir(resultados, duracion_total, args):
+    endpoints = {}
+    for nombre in sorted(resultados):
+        r = resultados[nombre]
+        d = r["duraciones"]
+        endpoints[nombre] = {
+            "peticiones": len(d),
+            "errores": r["errores"],
+            "p50_ms": round(percentil(d, 50) * 1000, 3),
+            "p95_ms": round(percentil(d, 95) * 1000, 3),
+            "p99_ms": round(percentil(d, 99) * 1000, 3),
+            "rps": round(len(d) / sum(d), 1),
+            "consultas_por_peticion": round(statistics.mean(r["consultas"]), 2),
+        }
+    total = sum(len(r["duraciones"]) for r in resultados.values())
+    return {
+        "meta": {
+            "commit": commit_actual(),
+            "python": platform.python_version(),
+            "reservaciones": args.reservaciones,
+            "cotizaciones": args.cotizaciones,
+            "usuarios": args.usuarios,
+            "hilos": args.hilos,
+            "semilla": args.semilla,
+            "bcrypt_rounds": args.bcrypt_rounds,
+        },
+        "total": {"peticiones": total, "segundos": round(duracion_total, 3), "rps": round(total / duracion_total, 1)},
+        "endpoints": endpoints,
+    }
+
+def commit_actual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    args = parsear_argumentos(argv)
+    # La configuración se lee al importar la aplicación, por eso se fija antes
+    os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    os.environ.setdefault("JWT_SECRET_KEY", "clave-de-benchmark-con-longitud-suficiente")
+    # Toda la carga sale de la misma IP y de pocos usuarios: con el límite activo se mediría sobre todo el 429
+    os.environ.setdefault("LIMITE_PETICIONES_ACTIVO", "false")
+    directorio = tempfile.mkdtemp(prefix="benchmark-")
+    url = args.base_datos or f"sqlite:///{os.path.join(directorio, 'benchmark.db')}"
+
+    from app import create_app, db, Usuario, Proveedor, Cotizacion, Reservacion, Rol, EstadoCotizacion, EstadoReservacion, TipoProveedor
+    from migraciones.migrador import aplicar_migraciones
+    from migraciones.versiones import MIGRACIONES
+    from flask_jwt_extended import create_access_token
+
+    rng = random.Random(args.semilla)
+    app = create_app({"SQLALCHEMY_DATABASE_URI": url})
+    log = lambda mensaje: print(mensaje, file=sys.stderr)
+
+    with app.app_context():
+        aplicar_migraciones(db.engine, db.metadata, MIGRACIONES, log=log)
+        contador = ContadorConsultas(db.engine)
+        ctx = Contexto(args, rng)
+        # Tokens con el formato actual de login (rol e id en los claims)
+        for rol, id_usuario in (("Administrador", 1), ("Agente", 2), ("Cliente", 6)):
+            ctx.tokens[rol] = create_access_token(identity=f"usuario{id_usuario}@bench.local",
+                                                  additional_claims={"role": rol, "id_usuario": id_usuario})
+
+    log(f"Generando {args.usuarios} usuarios, {args.cotizaciones} cotizaciones y {args.reservaciones} reservaciones...")
+    poblar(app, db, (Usuario, Proveedor, Cotizacion, Reservacion, Rol, EstadoCotizacion, EstadoReservacion, TipoProveedor), args, rng)
+
+    # La carga con Core no pasa por los eventos del ORM, así que el resumen de estados se recalcula
+    app.test_cli_runner().invoke(args=["reconstruir-resumen"])
+
+    log(f"Ejecutando {args.peticiones} peticiones con {args.hilos} hilo(s)...")
+    resultados, duracion = ejecutar_carga(app, contador, ctx, args)
+    informe = json.dumps(resumir(resultados, duracion, args), indent=2, ensure_ascii=False)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(informe + "\n")
+        log(f"Resultados guardados en {args.salida}")
+    else:
+        print(informe)
+
+if __name__ == "__main__":
+    main()
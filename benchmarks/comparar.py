@@ -0,0 +1,53 @@
+"""Compara dos informes de benchmarks/carga.py (por ejemplo, antes y después de un cambio).
+
+Uso:
+    python -m benchmarks.comparar base.json nuevo.json [--umbral 10]
+
+Termina con código 1 si el p95 de alguna operación empeora más que el umbral (en %)
+o si aumentan las consultas por petición.
+"""
+import argparse
+import json
+import sys
+
+def cambio(antes, despues):
+    if not antes:
+        return 0.0
+    return (despues - antes) / antes * 100
+
+def comparar(base, nuevo, umbral):
+    regresiones = []
+    print(f"{'operación':<45} {'p95 antes':>10} {'p95 después':>12} {'cambio':>8} {'consultas':>12}")
+    for nombre, b in base["endpoints"].items():
+        n = nuevo["endpoints"].get(nombre)
+        if n is None:
+            continue
+        delta = cambio(b["p95_ms"], n["p95_ms"])
+        consultas = f"{b['consultas_por_peticion']} -> {n['consultas_por_peticion']}"
+        print(f"{nombre:<45} {b['p95_ms']:>10} {n['p95_ms']:>12} {delta:>7.1f}% {consultas:>12}")
+        if delta > umbral:
+            regresiones.append(f"{nombre}: p95 {delta:.1f}% más lento")
+        if n["consultas_por_peticion"] > b["consultas_por_peticion"]:
+            regresiones.append(f"{nombre}: {consultas} consultas por petición")
+    print(f"\nTotal: {base['total']['rps']} -> {nuevo['total']['rps']} peticiones/s")
+    return regresiones
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara dos informes de benchmark")
+    parser.add_argument("base")
+    parser.add_argument("nuevo")
+    parser.add_argument("--umbral", type=float, default=10.0, help="empeoramiento máximo tolerado del p95, en %%")
+    args = parser.parse_args(argv)
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.nuevo, encoding="utf-8") as f:
+        nuevo = json.load(f)
+
+    regresiones = comparar(base, nuevo, args.umbral)
+    if regresiones:
+        print("\nRegresiones:\n  " + "\n  ".join(regresiones))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
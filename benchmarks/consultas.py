@@ -0,0 +1,79 @@
+"""Verifica que la cantidad de consultas SQL de los listados no crece con la cantidad de filas (sin N+1).
+
+Ejecuta cada URL contra bases con distinto volumen de datos y termina con código 1 si la
+cantidad de consultas por petición cambia entre escalas.
+
+Uso:
+    python -m benchmarks.consultas [--escalas 10 100 1000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+URLS = [
+    "/reservaciones?include=usuario",
+    "/reservaciones?include=usuario&limit=500",
+    "/reservaciones/1?include=usuario",
+    "/cotizaciones?include=usuario",
+    "/cotizaciones?include=usuario&fields=id,estado&limit=500",
+    "/cotizaciones/1?include=usuario",
+]
+
+def contar_consultas(escala):
+    from app import create_app, db, Usuario, Cotizacion, Reservacion, Rol, EstadoCotizacion, EstadoReservacion
+    from migraciones.migrador import aplicar_migraciones
+    from migraciones.versiones import MIGRACIONES
+    from flask_jwt_extended import create_access_token
+    from benchmarks.carga import ContadorConsultas
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='consultas-'), 'consultas.db')}"
+    app = create_app({"SQLALCHEMY_DATABASE_URI": url})
+    resultados = {}
+    with app.app_context():
+        aplicar_migraciones(db.engine, db.metadata, MIGRACIONES, log=lambda mensaje: None)
+        hoy = date.today()
+        # Un usuario por cada 2 filas, para que la relación apunte a muchos usuarios distintos
+        usuarios = max(2, escala // 2)
+        db.session.execute(db.insert(Usuario), [
+            {"nombre": f"Usuario {i}", "cedula": str(i), "correo_electronico": f"u{i}@consultas.local", "hash_contrasena": "x",
+             "rol": Rol.Administrador if i == 1 else Rol.Cliente, "fecha_creacion": hoy, "fecha_actualizacion": hoy}
+            for i in range(1, usuarios + 1)])
+        db.session.execute(db.insert(Reservacion), [
+            {"fecha_inicio": hoy, "fecha_fin": hoy + timedelta(days=1), "detalle": "x", "estado": EstadoReservacion.Confirmada,
+             "id_usuario": 1 + i % usuarios, "fecha_creacion": hoy, "fecha_actualizacion": hoy} for i in range(escala)])
+        db.session.execute(db.insert(Cotizacion), [
+            {"servicio": "s", "detalle": "d", "estado": EstadoCotizacion.Pendiente, "id_usuario": 1 + i % usuarios,
+             "fecha_creacion": hoy, "fecha_actualizacion": hoy} for i in range(escala)])
+        db.session.commit()
+        contador = ContadorConsultas(db.engine)
+        token = create_access_token(identity="u1@consultas.local", additional_claims={"role": "Administrador", "id_usuario": 1})
+
+    cliente = app.test_client()
+    for url_peticion in URLS:
+        contador.reiniciar()
+        respuesta = cliente.get(url_peticion, headers={"Authorization": f"Bearer {token}"})
+        if respuesta.status_code != 200:
+            raise SystemExit(f"{url_peticion} respondió {respuesta.status_code}")
+        resultados[url_peticion] = contador.valor()
+    return resultados
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escalas", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args(argv)
+    os.environ.setdefault("JWT_SECRET_KEY", "clave-de-benchmark-con-longitud-suficiente")
+
+    por_escala = {escala: contar_consultas(escala) for escala in args.escalas}
+    correcto = True
+    for url in URLS:
+        cantidades = [por_escala[e][url] for e in args.escalas]
+        estado = "OK" if len(set(cantidades)) == 1 else "FALLA"
+        correcto = correcto and estado == "OK"
+        print(f"[{estado}] {url}: " + ", ".join(f"{e} filas -> {c} consultas" for e, c in zip(args.escalas, cantidades)))
+    if not correcto:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Micro-benchmark del costo de validar el cuerpo de cada petición.
+
+Compara las validaciones escritas a mano que tenían los endpoints (regex compiladas y listas de
+enums reconstruidas en cada llamada, datetime.strptime para las fechas) con los esquemas
+precompilados de utils/validacion.py, sobre los mismos cuerpos válidos e inválidos. No toca
+la base de datos: mide solo la validación.
+
+Uso:
+    python -m benchmarks.validacion [--repeticiones 20000]
+"""
+import argparse
+import json
+import sys
+import timeit
+
+# --- Validaciones anteriores, copiadas de los endpoints antes de los esquemas (solo para comparar) ---
+
+def antes_usuario(data, Rol):
+    if not data.get('nombre'):
+        return "El campo 'nombre' es obligatorio"
+    if not data.get('cedula'):
+        return "El campo 'cedula' es obligatorio"
+    if not data.get('contrasena'):
+        return "El campo 'contrasena' es obligatorio"
+    if not data.get('correo_electronico'):
+        return "El campo 'correo_electronico' es obligatorio"
+    import re
+    email_regex = r"^[\w\.-]+@[\w\.-]+\.\w+$"
+    if not re.match(email_regex, data['correo_electronico']):
+        return "El correo electrónico no es válido"
+    rol_value = data['rol']
+    valid_roles = [r.name for r in Rol]
+    if isinstance(rol_value, int):
+        try:
+            Rol(rol_value)
+        except ValueError:
+            return f"El rol '{rol_value}' no es válido"
+    elif rol_value not in valid_roles:
+        return f"El rol '{rol_value}' no es válido"
+
+def antes_proveedor(data, TipoProveedor):
+    if not data.get('nombre'):
+        return "El campo 'nombre' es obligatorio"
+    if not data.get('enlace'):
+        return "El campo 'enlace' es obligatorio"
+    import re
+    url_regex = r"^(https?://)?([\w\-]+\.)+[\w\-]+(/[^\sß]*)?$"
+    if not re.match(url_regex, data['enlace']):
+        return "El campo 'enlace' debe ser una URL válida"
+    tipo_value = data.get('tipo')
+    valid_tipos = [t.name for t in TipoProveedor]
+    if isinstance(tipo_value, int):
+        try:
+            TipoProveedor(tipo_value)
+        except ValueError:
+            return f"El tipo '{tipo_value}' no es válido"
+    elif tipo_value not in valid_tipos:
+        return f"El tipo '{tipo_value}' no es válido"
+
+def antes_reservacion(data, EstadoReservacion, max_dias):
+    from datetime import datetime
+    for campo in ('fecha_inicio', 'fecha_fin', 'detalle', 'id_usuario', 'estado'):
+        if not data.get(campo):
+            return f"El campo '{campo}' es obligatorio"
+    try:
+        fecha_inicio = datetime.strptime(data['fecha_inicio'], "%Y-%m-%d").date()
+    except Exception:
+        return "El campo 'fecha_inicio' debe tener formato YYYY-MM-DD"
+    try:
+        fecha_fin = datetime.strptime(data['fecha_fin'], "%Y-%m-%d").date()
+    except Exception:
+        return "El campo 'fecha_fin' debe tener formato YYYY-MM-DD"
+    if fecha_fin <= fecha_inicio:
+        return "La fecha de fin debe ser posterior a la fecha de inicio"
+    if (fecha_fin - fecha_inicio).days > max_dias:
+        return f"Una reservación no puede durar más de {max_dias} días"
+    estado_value = data['estado']
+    valid_estados = [e.name for e in EstadoReservacion]
+    if isinstance(estado_value, int):
+        try:
+            EstadoReservacion(estado_value)
+        except ValueError:
+            return f"El estado '{estado_value}' no es válido"
+    elif estado_value not in valid_estados:
+        return f"El estado '{estado_value}' no es válido"
+
+def casos():
+    import app
+    usuario = {"nombre": "Ana", "cedula": "123", "contrasena": "secreta", "correo_electronico": "ana@example.com", "rol": "Cliente"}
+    proveedor = {"nombre": "Hotel Sol", "enlace": "https://hotelsol.example.com/reservas", "tipo": "Hotel"}
+    reservacion = {"fecha_inicio": "2026-01-10", "fecha_fin": "2026-01-15", "detalle": "Habitación doble",
+                   "id_usuario": 7, "estado": "Confirmada"}
+    return [
+        ("crear_usuario (válido)", usuario,
+         lambda d: antes_usuario(d, app.Rol), app.ESQUEMA_USUARIO.validar),
+        ("crear_usuario (inválido)", {**usuario, "correo_electronico": "ana", "rol": "Jefe"},
+         lambda d: antes_usuario(d, app.Rol), app.ESQUEMA_USUARIO.validar),
+        ("crear_proveedor (válido)", proveedor,
+         lambda d: antes_proveedor(d, app.TipoProveedor), app.ESQUEMA_PROVEEDOR.validar),
+        ("actualizar_reservacion (válido)", reservacion,
+         lambda d: antes_reservacion(d, app.EstadoReservacion, app.RESERVACION_MAX_DIAS), app.ESQUEMA_ACTUALIZAR_RESERVACION.validar),
+        ("actualizar_reservacion (inválido)", {**reservacion, "fecha_fin": "2026-01-01", "estado": "Otro"},
+         lambda d: antes_reservacion(d, app.EstadoReservacion, app.RESERVACION_MAX_DIAS), app.ESQUEMA_ACTUALIZAR_RESERVACION.validar),
+    ]
+
+def medir(funcion, data, repeticiones):
+    # Mejor de 5 series, en microsegundos por llamada
+    tiempos = timeit.repeat(lambda: funcion(data), number=repeticiones, repeat=5)
+    return round(min(tiempos) / repeticiones * 1e6, 3)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=20_000, help="llamadas por serie")
+    args = parser.parse_args(argv)
+
+    resultados = {}
+    for nombre, data, antes, despues in casos():
+        us_antes = medir(antes, data, args.repeticiones)
+        us_despues = medir(despues, data, args.repeticiones)
+        resultados[nombre] = {"antes_us": us_antes, "despues_us": us_despues, "mejora": round(us_antes / us_despues, 2)}
+        print(f"{nombre}: {us_antes} us -> {us_despues} us ({resultados[nombre]['mejora']}x)", file=sys.stderr)
+    print(json.dumps(resultados, indent=2, ensure_ascii=False))
+
+if __name__ == '__main__':
+    main()
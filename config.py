@@ -0,0 +1,60 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def env_bool(nombre, defecto):
+    return os.getenv(nombre, str(defecto)).strip().lower() in ('1', 'true', 'si', 'sí', 'yes')
+
+def url_base_datos():
+    # DATABASE_URL tiene prioridad; si no existe se arma la URL de MySQL con las variables sueltas
+    if os.getenv('DATABASE_URL'):
+        return os.getenv('DATABASE_URL')
+    db_user = os.getenv('DB_USER', 'root')
+    db_password = os.getenv('DB_PASSWORD', '')
+    db_host = os.getenv('DB_HOST', 'localhost')
+    db_name = os.getenv('DB_NAME', 'default')
+    return f'mysql+mysqlconnector://{db_user}:{db_password}@{db_host}/{db_name}?auth_plugin=caching_sha2_password'
+
+def opciones_motor(url):
+    """Parámetros del pool de conexiones de SQLAlchemy, configurables desde el entorno.
+
+    Cada proceso del servidor tiene su propio pool: el total de conexiones posibles es
+    workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) y debe quedar por debajo de max_connections de MySQL.
+    """
+    opciones = {
+        # Comprueba la conexión antes de usarla para descartar las que MySQL cerró por inactividad
+        'pool_pre_ping': env_bool('DB_POOL_PRE_PING', True),
+        # Recicla las conexiones antes de que venzan en el servidor (wait_timeout)
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+    }
+    if url.startswith('sqlite'):
+        return opciones
+
+    opciones.update({
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
+    })
+    if url.startswith('mysql'):
+        opciones['connect_args'] = {'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 10))}
+    return opciones
+
+def binds_replicas(urls):
+    """Un bind de Flask-SQLAlchemy por cada réplica de lectura ('replica_1', 'replica_2', ...).
+
+    `urls` es la lista separada por comas de DATABASE_REPLICA_URLS. Cada réplica tiene su propio pool
+    con las mismas opciones que la base principal.
+    """
+    urls = [url.strip() for url in (urls or '').split(',') if url.strip()]
+    return {f'replica_{i}': {'url': url, **opciones_motor(url)} for i, url in enumerate(urls, start=1)}
+
+def cargar_configuracion():
+    url = url_base_datos()
+    return {
+        'SQLALCHEMY_DATABASE_URI': url,
+        'SQLALCHEMY_ENGINE_OPTIONS': opciones_motor(url),
+        'SQLALCHEMY_BINDS': binds_replicas(os.getenv('DATABASE_REPLICA_URLS')),
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'JWT_SECRET_KEY': os.getenv('JWT_SECRET_KEY'),
+    }
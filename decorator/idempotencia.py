@@ -0,0 +1,72 @@
+import hashlib
+import json
+from functools import wraps
+from flask import current_app, jsonify, g, request, Response
+from utils.metricas import idempotencia
+
+ENCABEZADO = 'Idempotency-Key'
+LONGITUD_MAXIMA_CLAVE = 255
+
+# Hace que los reintentos de un POST con el mismo encabezado Idempotency-Key devuelvan la respuesta
+# guardada en lugar de volver a ejecutar el alta. `almacen` es un backend de utils.cache compartido entre
+# procesos (Redis o la tabla almacen_compartido) con get/agregar/set/delete; la clave se marca "en proceso"
+# de forma atómica antes de ejecutar la vista, así que de dos peticiones simultáneas con la misma clave
+# solo una llega a la base de datos.
+# `ttl` es lo que se conserva la respuesta y `ttl_proceso` el máximo que puede quedar marcada en proceso
+# (por si el proceso muere a mitad de la petición).
+def idempotente(almacen, ttl=86400, ttl_proceso=60):
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(*args, **kwargs):
+            clave_cliente = request.headers.get(ENCABEZADO)
+            if clave_cliente is None:
+                return fn(*args, **kwargs)
+            if not clave_cliente or len(clave_cliente) > LONGITUD_MAXIMA_CLAVE:
+                return jsonify({"error": f"El encabezado '{ENCABEZADO}' debe tener entre 1 y {LONGITUD_MAXIMA_CLAVE} caracteres"}), 400
+
+            # La misma clave de dos usuarios distintos no se mezcla
+            principal = g.get("principal")
+            identidad = principal.correo_electronico if principal else "anonimo"
+            clave = f"{request.endpoint}:{identidad}:{clave_cliente}"
+            huella = hashlib.sha256(request.query_string + b"?" + request.get_data()).hexdigest()
+
+            if not almacen.agregar(clave, json.dumps({"estado": "en_proceso", "huella": huella}), ttl=ttl_proceso):
+                guardada = almacen.get(clave)
+                if guardada is not None:
+                    return repetir(json.loads(guardada), huella)
+                # Expiró entre las dos operaciones: se reintenta la reserva una sola vez
+                if not almacen.agregar(clave, json.dumps({"estado": "en_proceso", "huella": huella}), ttl=ttl_proceso):
+                    return en_proceso()
+
+            try:
+                respuesta = current_app.make_response(fn(*args, **kwargs))
+            except Exception:
+                almacen.delete(clave)
+                raise
+
+            # Los errores del servidor no se guardan para que el cliente pueda reintentar
+            if respuesta.status_code >= 500 or respuesta.is_streamed:
+                almacen.delete(clave)
+                return respuesta
+            almacen.set(clave, json.dumps({
+                "estado": "completada", "huella": huella, "codigo": respuesta.status_code,
+                "tipo": respuesta.mimetype, "cuerpo": respuesta.get_data(as_text=True)}), ttl=ttl)
+            idempotencia.incrementar(request.endpoint, "nueva")
+            return respuesta
+        return decorator
+    return wrapper
+
+def en_proceso():
+    idempotencia.incrementar(request.endpoint, "en_proceso")
+    return jsonify({"error": "Ya hay una petición en curso con el mismo Idempotency-Key"}), 409, {"Retry-After": "1"}
+
+def repetir(guardada, huella):
+    if guardada["huella"] != huella:
+        idempotencia.incrementar(request.endpoint, "conflicto")
+        return jsonify({"error": "El Idempotency-Key ya se usó con otra petición"}), 422
+    if guardada["estado"] == "en_proceso":
+        return en_proceso()
+    idempotencia.incrementar(request.endpoint, "repetida")
+    respuesta = Response(guardada["cuerpo"], status=guardada["codigo"], mimetype=guardada["tipo"])
+    respuesta.headers["Idempotent-Replayed"] = "true"
+    return respuesta
@@ -0,0 +1,26 @@
+from functools import wraps
+
+# Función que aplica el límite de la petición actual: devuelve None si se admite o la respuesta 429.
+# La registra app.py, que define los límites por ruta y dónde se guardan las cubetas.
+verificar_limite = None
+
+def registrar_limitador(fn):
+    global verificar_limite
+    verificar_limite = fn
+    return fn
+
+def rechazo_por_limite():
+    if verificar_limite is None:
+        return None
+    return verificar_limite()
+
+# Para las rutas sin token (login, alta de usuarios), que se limitan por IP.
+# Las rutas con role_required se limitan dentro de ese decorador, ya con el usuario identificado.
+def limitado(fn):
+    @wraps(fn)
+    def decorator(*args, **kwargs):
+        rechazo = rechazo_por_limite()
+        if rechazo is not None:
+            return rechazo
+        return fn(*args, **kwargs)
+    return decorator
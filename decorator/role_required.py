@@ -1,12 +1,34 @@
+import time
 from functools import wraps
-from flask_jwt_extended import verify_jwt_in_request, get_jwt
-from flask import jsonify
+from flask_jwt_extended import verify_jwt_in_request, get_jwt, get_jwt_identity
+from flask import jsonify, g, request
 from flask_jwt_extended.exceptions import NoAuthorizationError, InvalidHeaderError
+from utils.metricas import duracion_autenticacion
+from decorator.limite_peticiones import rechazo_por_limite
+
+# Usuario autenticado de la petición, con el id ya resuelto
+class Principal:
+    def __init__(self, correo_electronico, rol, id_usuario=None):
+        self.correo_electronico = correo_electronico
+        self.rol = rol
+        self.id_usuario = id_usuario
+
+# Función que obtiene el id a partir del correo, para tokens emitidos antes de incluir 'id_usuario' en los claims
+resolver_id_usuario = None
+
+def registrar_resolver_id(fn):
+    global resolver_id_usuario
+    resolver_id_usuario = fn
+    return fn
+
+def get_principal():
+    return g.get("principal")
 
 def role_required(roles):
     def wrapper(fn):
         @wraps(fn)
         def decorator(*args, **kwargs):
+            inicio = time.perf_counter()
             try:
                 verify_jwt_in_request()
             except Exception:
@@ -14,6 +36,17 @@ def role_required(roles):
             claims = get_jwt()
             if claims.get("role") not in roles:
                 return jsonify({"msg": "Acceso denegado, se requiere rol(es): " + str(roles)}), 403
+
+            correo_electronico = get_jwt_identity()
+            id_usuario = claims.get("id_usuario")
+            if id_usuario is None and resolver_id_usuario is not None:
+                id_usuario = resolver_id_usuario(correo_electronico)
+            g.principal = Principal(correo_electronico, claims.get("role"), id_usuario)
+            duracion_autenticacion.observar(time.perf_counter() - inicio, request.endpoint)
+
+            rechazo = rechazo_por_limite()
+            if rechazo is not None:
+                return rechazo
             return fn(*args, **kwargs)
         return decorator
     return wrapper
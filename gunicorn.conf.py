@@ -0,0 +1,19 @@
+# Configuración de gunicorn para producción. Todos los valores se pueden ajustar desde el entorno.
+import multiprocessing
+import os
+
+bind = os.getenv('WEB_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+# Hilos por worker: las peticiones esperan sobre todo a MySQL y a bcrypt, que liberan el GIL
+threads = int(os.getenv('WEB_THREADS', 4))
+worker_class = 'gthread'
+timeout = int(os.getenv('WEB_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('WEB_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('WEB_KEEPALIVE', 5))
+# Reinicia cada worker tras N peticiones (con variación aleatoria) para acotar el crecimiento de memoria
+max_requests = int(os.getenv('WEB_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.getenv('WEB_MAX_REQUESTS_JITTER', 1000))
+# Sin preload: cada worker crea su propio pool de conexiones después del fork
+preload_app = False
+accesslog = '-'
+errorlog = '-'
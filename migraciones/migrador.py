@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, inspect, select
+
+# Tabla propia del migrador: guarda qué versiones del esquema ya se aplicaron
+metadata_migraciones = MetaData()
+
+version_esquema = Table(
+    'version_esquema', metadata_migraciones,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('descripcion', String(200), nullable=False),
+    Column('fecha_aplicacion', DateTime, nullable=False),
+)
+
+class ErrorMigracion(Exception):
+    """La migración no se puede aplicar con los datos actuales; el mensaje indica qué corregir."""
+
+def versiones_aplicadas(engine):
+    metadata_migraciones.create_all(engine)
+    with engine.connect() as conexion:
+        return set(conexion.execute(select(version_esquema.c.version)).scalars())
+
+def aplicar_migraciones(engine, metadata, migraciones, log=print):
+    """Aplica en orden las migraciones pendientes. Cada una corre en su propia transacción
+    y queda registrada en `version_esquema`, por lo que se puede volver a ejecutar sin efecto."""
+    aplicadas = versiones_aplicadas(engine)
+    pendientes = [m for m in migraciones if m[0] not in aplicadas]
+    for version, descripcion, funcion in pendientes:
+        log(f"Aplicando migración {version}: {descripcion}")
+        with engine.begin() as conexion:
+            funcion(conexion, metadata)
+            conexion.execute(version_esquema.insert().values(
+                version=version, descripcion=descripcion, fecha_aplicacion=datetime.now()))
+    if not pendientes:
+        log("El esquema está actualizado")
+    return [m[0] for m in pendientes]
+
+# --- Utilidades para escribir migraciones idempotentes ---
+
+def crear_indices(conexion, metadata, tabla, nombres):
+    # Crea los índices declarados en el modelo que todavía no existan en la base de datos
+    existentes = {i['name'] for i in inspect(conexion).get_indexes(tabla)}
+    for indice in metadata.tables[tabla].indexes:
+        if indice.name in nombres and indice.name not in existentes:
+            indice.create(conexion)
+
+def agregar_columna(conexion, metadata, tabla, nombre):
+    # Agrega una columna declarada en el modelo si la tabla todavía no la tiene
+    existentes = {c['name'] for c in inspect(conexion).get_columns(tabla)}
+    if nombre in existentes:
+        return
+    columna = metadata.tables[tabla].c[nombre]
+    tipo = columna.type.compile(dialect=conexion.dialect)
+    sql = f"ALTER TABLE {tabla} ADD COLUMN {nombre} {tipo}"
+    if not columna.nullable:
+        sql += " NOT NULL"
+    if columna.server_default is not None:
+        sql += f" DEFAULT {columna.server_default.arg}"
+    conexion.exec_driver_sql(sql)
@@ -0,0 +1,29 @@
+# Verificación de planes de ejecución: corre EXPLAIN sobre las consultas de los endpoints
+# y detecta las que recorren la tabla completa.
+
+def compilar(conexion, consulta):
+    return str(consulta.compile(dialect=conexion.dialect, compile_kwargs={"literal_binds": True}))
+
+def recorridos_completos(conexion, consulta):
+    """Devuelve las tablas que el plan de la consulta recorre completas (lista vacía si usa índices)."""
+    sql = compilar(conexion, consulta)
+    if conexion.dialect.name == 'sqlite':
+        # Filas de EXPLAIN QUERY PLAN: (id, parent, notused, detail). 'SCAN tabla' sin índice = recorrido completo
+        plan = conexion.exec_driver_sql("EXPLAIN QUERY PLAN " + sql).all()
+        return [fila[3] for fila in plan if fila[3].startswith("SCAN") and "USING" not in fila[3]]
+
+    # MySQL: la columna 'type' con valor 'ALL' indica un recorrido completo de la tabla
+    plan = conexion.exec_driver_sql("EXPLAIN " + sql).mappings().all()
+    return [fila['table'] for fila in plan if fila['type'] == 'ALL']
+
+def verificar_consultas(conexion, consultas, log=print):
+    """Revisa cada consulta con nombre y devuelve True si ninguna hace un recorrido completo."""
+    correcto = True
+    for nombre, consulta in consultas.items():
+        recorridos = recorridos_completos(conexion, consulta)
+        if recorridos:
+            correcto = False
+            log(f"[FALLA] {nombre}: recorrido completo en {', '.join(recorridos)}")
+        else:
+            log(f"[OK] {nombre}")
+    return correcto
@@ -0,0 +1,94 @@
+from datetime import datetime
+
+from sqlalchemy import select, literal, func
+
+from migraciones.migrador import ErrorMigracion, crear_indices, agregar_columna
+from utils import resumen
+from utils.fechas import dias_entre
+
+# Migraciones del esquema: (versión, descripción, función). Nunca modificar una versión ya publicada;
+# los cambios nuevos se agregan al final con el siguiente número.
+
+def esquema_inicial(conexion, metadata):
+    # Crea las tablas que falten; en una base de datos nueva ya incluye todos los índices del modelo
+    metadata.create_all(conexion)
+
+MAX_DUPLICADOS_INFORMADOS = 20
+
+def indices_consultas_frecuentes(conexion, metadata):
+    # El índice único falla con un IntegrityError poco claro si hay correos repetidos: se informan antes
+    usuario = metadata.tables['usuario']
+    duplicados = conexion.execute(
+        select(usuario.c.correo_electronico, func.count()).group_by(usuario.c.correo_electronico)
+        .having(func.count() > 1).order_by(usuario.c.correo_electronico).limit(MAX_DUPLICADOS_INFORMADOS)).all()
+    if duplicados:
+        detalle = ", ".join(f"{correo} ({cantidad} usuarios)" for correo, cantidad in duplicados)
+        raise ErrorMigracion("No se puede crear el índice único de correo_electronico: hay correos repetidos "
+                             f"(se muestran hasta {MAX_DUPLICADOS_INFORMADOS}): {detalle}. "
+                             "Corregirlos y volver a ejecutar la migración.")
+    crear_indices(conexion, metadata, 'usuario', ['ux_usuario_correo_electronico'])
+    crear_indices(conexion, metadata, 'cotizacion', ['ix_cotizacion_id_usuario_id', 'ix_cotizacion_estado_fecha_creacion'])
+    crear_indices(conexion, metadata, 'reservacion', ['ix_reservacion_id_usuario_id', 'ix_reservacion_estado_fecha_inicio'])
+
+def indices_solapamientos(conexion, metadata):
+    crear_indices(conexion, metadata, 'reservacion', [
+        'ix_reservacion_fecha_inicio_fecha_fin', 'ix_reservacion_id_usuario_fecha_inicio_fecha_fin'])
+
+def tabla_resumen_estado(conexion, metadata):
+    tabla = metadata.tables['resumen_estado']
+    tabla.create(conexion, checkfirst=True)
+    # Carga inicial de los contadores con los datos existentes
+    resumen.reconstruir(conexion, tabla, {
+        'cotizacion': metadata.tables['cotizacion'],
+        'reservacion': metadata.tables['reservacion'],
+    })
+
+def tabla_registro_cambios(conexion, metadata):
+    tabla = metadata.tables['registro_cambios']
+    tabla.create(conexion, checkfirst=True)
+    # Cada registro existente entra como 'alta', así una sincronización desde 0 equivale a una descarga completa
+    ahora = datetime.now()
+    for entidad in ('cotizacion', 'reservacion'):
+        origen = metadata.tables[entidad]
+        consulta = select(literal(entidad), origen.c.id, origen.c.id_usuario, literal('alta'), literal(ahora)).order_by(origen.c.id)
+        conexion.execute(tabla.insert().from_select(['entidad', 'id_registro', 'id_usuario', 'operacion', 'fecha'], consulta))
+
+def indices_texto(conexion, metadata):
+    # Los índices FULLTEXT se declaran solo para MySQL (ddl_if); en otras bases esto no crea nada
+    crear_indices(conexion, metadata, 'proveedor', ['ft_proveedor_nombre'])
+    crear_indices(conexion, metadata, 'cotizacion', ['ft_cotizacion_servicio_detalle'])
+
+def columnas_version(conexion, metadata):
+    # Los registros existentes empiezan en la versión 1 (DEFAULT de la columna)
+    agregar_columna(conexion, metadata, 'cotizacion', 'version')
+    agregar_columna(conexion, metadata, 'reservacion', 'version')
+
+def columna_duracion(conexion, metadata):
+    agregar_columna(conexion, metadata, 'reservacion', 'duracion')
+    tabla = metadata.tables['reservacion']
+    # fecha_actualizacion se conserva: la columna es nueva, los registros no cambiaron
+    conexion.execute(tabla.update().values(duracion=dias_entre(tabla.c.fecha_inicio, tabla.c.fecha_fin),
+                                           fecha_actualizacion=tabla.c.fecha_actualizacion))
+    crear_indices(conexion, metadata, 'reservacion', ['ix_reservacion_duracion'])
+
+def bloqueo_registro_cambios(conexion, metadata):
+    tabla = metadata.tables['bloqueo_registro_cambios']
+    tabla.create(conexion, checkfirst=True)
+    if conexion.execute(select(tabla.c.id).where(tabla.c.id == 1)).first() is None:
+        conexion.execute(tabla.insert().values(id=1, transacciones=0))
+
+def tabla_almacen_compartido(conexion, metadata):
+    metadata.tables['almacen_compartido'].create(conexion, checkfirst=True)
+
+MIGRACIONES = [
+    (1, "Esquema inicial", esquema_inicial),
+    (2, "Índices para login, listados por usuario y filtros por estado/fecha", indices_consultas_frecuentes),
+    (3, "Índices de intervalo de fechas para consultas de solapamiento", indices_solapamientos),
+    (4, "Tabla de contadores del resumen de estados", tabla_resumen_estado),
+    (5, "Registro de cambios para sincronización incremental", tabla_registro_cambios),
+    (6, "Índices FULLTEXT para la búsqueda de proveedores y cotizaciones", indices_texto),
+    (7, "Columna version para control de concurrencia optimista", columnas_version),
+    (8, "Columna duracion de las reservaciones para acotar la búsqueda de solapamientos", columna_duracion),
+    (9, "Fila de bloqueo para asignar los seq del registro de cambios en orden de commit", bloqueo_registro_cambios),
+    (10, "Tabla clave-valor compartida entre procesos (Idempotency-Key sin Redis)", tabla_almacen_compartido),
+]
@@ -0,0 +1,105 @@
+import math
+import re
+import threading
+import unicodedata
+
+# Búsqueda de texto en memoria para las bases sin índice FULLTEXT (SQLite en desarrollo y pruebas).
+# En MySQL la búsqueda se resuelve con MATCH ... AGAINST sobre los índices FULLTEXT (ver app.py).
+
+LONGITUD_MINIMA = 2
+_SEPARADOR = re.compile(r"[^\w]+")
+
+def tokenizar(texto):
+    """Separa el texto en palabras en minúsculas y sin acentos ("Habitación" y "habitacion" coinciden)."""
+    if not texto:
+        return []
+    texto = unicodedata.normalize('NFKD', texto.lower())
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return [t for t in _SEPARADOR.split(texto) if len(t) >= LONGITUD_MINIMA]
+
+class IndiceInvertido:
+    """Índice invertido palabra -> {id: frecuencia} con ranking BM25.
+
+    Guarda además el id_usuario de cada documento para aplicar en la búsqueda la misma
+    restricción por rol que los listados. Es seguro para usar desde varios hilos.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Hasta dónde está sincronizado con la base de datos; lo define quien carga el índice
+        self.marca = None
+        self.vaciar()
+
+    def vaciar(self):
+        self._terminos = {}
+        self._longitudes = {}
+        self._palabras = {}
+        self._duenos = {}
+        self._total_longitud = 0
+
+    def reemplazar(self, otro):
+        """Toma de una vez el contenido de `otro`, cargado aparte: las búsquedas ven el índice
+        anterior o el nuevo completo, nunca uno a medio cargar."""
+        with self._lock:
+            self._terminos = otro._terminos
+            self._longitudes = otro._longitudes
+            self._palabras = otro._palabras
+            self._duenos = otro._duenos
+            self._total_longitud = otro._total_longitud
+
+    def agregar(self, id, texto, id_usuario=None):
+        # Reemplaza el documento si ya estaba indexado
+        palabras = tokenizar(texto)
+        with self._lock:
+            self._quitar(id)
+            frecuencias = {}
+            for palabra in palabras:
+                frecuencias[palabra] = frecuencias.get(palabra, 0) + 1
+            for palabra, frecuencia in frecuencias.items():
+                self._terminos.setdefault(palabra, {})[id] = frecuencia
+            self._palabras[id] = tuple(frecuencias)
+            self._longitudes[id] = len(palabras)
+            self._duenos[id] = id_usuario
+            self._total_longitud += len(palabras)
+
+    def quitar(self, id):
+        with self._lock:
+            self._quitar(id)
+
+    def _quitar(self, id):
+        for palabra in self._palabras.pop(id, ()):
+            documentos = self._terminos[palabra]
+            del documentos[id]
+            if not documentos:
+                del self._terminos[palabra]
+        self._total_longitud -= self._longitudes.pop(id, 0)
+        self._duenos.pop(id, None)
+
+    def buscar(self, consulta, id_usuario=None):
+        """Devuelve [(id, puntaje)] de los documentos que contienen alguna palabra de la consulta,
+        ordenados de mayor a menor puntaje (y por id ante empates). Con id_usuario solo se
+        consideran los documentos de ese usuario."""
+        palabras = set(tokenizar(consulta))
+        puntajes = {}
+        with self._lock:
+            total = len(self._longitudes)
+            if not total:
+                return []
+            promedio = self._total_longitud / total or 1
+            for palabra in palabras:
+                documentos = self._terminos.get(palabra)
+                if not documentos:
+                    continue
+                idf = math.log(1 + (total - len(documentos) + 0.5) / (len(documentos) + 0.5))
+                for id, frecuencia in documentos.items():
+                    if id_usuario is not None and self._duenos.get(id) != id_usuario:
+                        continue
+                    normalizacion = self.K1 * (1 - self.B + self.B * self._longitudes[id] / promedio)
+                    puntajes[id] = puntajes.get(id, 0) + idf * frecuencia * (self.K1 + 1) / (frecuencia + normalizacion)
+        return sorted(puntajes.items(), key=lambda item: (-item[1], item[0]))
+
+    def __len__(self):
+        return len(self._longitudes)
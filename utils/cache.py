@@ -0,0 +1,133 @@
+import hashlib
+import time
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from utils.cache_ttl import CacheTTL
+
+class CacheRedis:
+    """Backend compartido entre procesos. Requiere el paquete opcional `redis`."""
+
+    def __init__(self, url, prefijo, ttl=300):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("Para usar CACHE_REDIS_URL se debe instalar el paquete 'redis'")
+        self.cliente = redis.Redis.from_url(url)
+        self.prefijo = prefijo
+        self.ttl = ttl
+
+    def get(self, clave, defecto=None):
+        valor = self.cliente.get(self.prefijo + clave)
+        return defecto if valor is None else valor
+
+    def set(self, clave, valor, ttl=None):
+        self.cliente.set(self.prefijo + clave, valor, ex=self.ttl if ttl is None else ttl)
+
+    def agregar(self, clave, valor, ttl=None):
+        return bool(self.cliente.set(self.prefijo + clave, valor, ex=self.ttl if ttl is None else ttl, nx=True))
+
+    def delete(self, clave):
+        self.cliente.delete(self.prefijo + clave)
+
+class CacheBaseDatos:
+    """Backend compartido entre procesos sobre una tabla de la base de datos (clave, valor, expira), para
+    cuando no hay Redis. Cada operación usa su propia transacción corta, independiente de la de la petición,
+    y la clave se guarda como hash para que quepa en la clave primaria."""
+
+    # Cada tantas altas por proceso se borran las entradas vencidas
+    PURGA_CADA = 500
+
+    def __init__(self, tabla, obtener_motor, prefijo, ttl=300):
+        self.tabla = tabla
+        self.obtener_motor = obtener_motor
+        self.prefijo = prefijo
+        self.ttl = ttl
+        self.altas = 0
+
+    def _clave(self, clave):
+        return hashlib.sha256((self.prefijo + clave).encode()).hexdigest()
+
+    def _expira(self, ttl):
+        return time.time() + (self.ttl if ttl is None else ttl)
+
+    def get(self, clave, defecto=None):
+        tabla = self.tabla
+        with self.obtener_motor().connect() as conexion:
+            valor = conexion.execute(select(tabla.c.valor).where(
+                tabla.c.clave == self._clave(clave), tabla.c.expira > time.time())).scalar()
+        return defecto if valor is None else valor
+
+    def set(self, clave, valor, ttl=None):
+        tabla = self.tabla
+        with self.obtener_motor().begin() as conexion:
+            actualizadas = conexion.execute(tabla.update().where(tabla.c.clave == self._clave(clave))
+                                            .values(valor=valor, expira=self._expira(ttl))).rowcount
+        if not actualizadas and not self.agregar(clave, valor, ttl):
+            # Otro proceso la creó entre las dos sentencias: gana el último en escribir
+            self.set(clave, valor, ttl)
+
+    def agregar(self, clave, valor, ttl=None):
+        # Guarda solo si la clave no existe (o ya venció); la clave primaria hace que sea atómico
+        tabla = self.tabla
+        self._purgar_si_corresponde()
+        try:
+            with self.obtener_motor().begin() as conexion:
+                conexion.execute(tabla.insert().values(clave=self._clave(clave), valor=valor, expira=self._expira(ttl)))
+            return True
+        except IntegrityError:
+            with self.obtener_motor().begin() as conexion:
+                return conexion.execute(tabla.update().where(tabla.c.clave == self._clave(clave), tabla.c.expira <= time.time())
+                                        .values(valor=valor, expira=self._expira(ttl))).rowcount == 1
+
+    def delete(self, clave):
+        with self.obtener_motor().begin() as conexion:
+            conexion.execute(self.tabla.delete().where(self.tabla.c.clave == self._clave(clave)))
+
+    def _purgar_si_corresponde(self):
+        self.altas += 1
+        if self.altas % self.PURGA_CADA == 0:
+            with self.obtener_motor().begin() as conexion:
+                conexion.execute(self.tabla.delete().where(self.tabla.c.expira <= time.time()))
+
+def crear_backend_compartido(prefijo, ttl, redis_url, tabla, obtener_motor):
+    # Siempre compartido entre procesos: Redis si está configurado, si no la tabla de la base de datos
+    if redis_url:
+        return CacheRedis(redis_url, prefijo, ttl)
+    return CacheBaseDatos(tabla, obtener_motor, prefijo, ttl)
+
+def crear_backend(prefijo, ttl=300, redis_url=None, max_entradas=1024):
+    # En memoria por defecto; con una URL de Redis la caché se comparte entre procesos
+    if redis_url:
+        return CacheRedis(redis_url, prefijo, ttl)
+    return CacheTTL(max_entradas=max_entradas, ttl=ttl)
+
+class CacheVersionada:
+    """Caché de lectura con invalidación por versión: invalidar() cambia la versión vigente
+    y las entradas anteriores dejan de usarse (expiran solas por TTL). Funciona igual con
+    cualquier backend, sin necesidad de recorrer ni borrar claves.
+
+    La versión puede guardarse en otro backend (`backend_version`): con uno compartido, un cambio
+    hecho en cualquier proceso invalida también las entradas que los demás guardan en memoria."""
+
+    def __init__(self, backend, backend_version=None):
+        self.backend = backend
+        self.backend_version = backend_version or backend
+
+    def version(self):
+        version = self.backend_version.get('version')
+        if version is None:
+            version = self.invalidar()
+        return version.decode() if isinstance(version, bytes) else version
+
+    def invalidar(self):
+        version = str(time.time_ns())
+        self.backend_version.set('version', version, ttl=10 ** 9)
+        return version
+
+    def get(self, clave):
+        return self.backend.get(f"{self.version()}:{clave}")
+
+    def set(self, clave, valor):
+        self.backend.set(f"{self.version()}:{clave}", valor)
@@ -0,0 +1,55 @@
+import threading
+import time
+from collections import OrderedDict
+
+class CacheTTL:
+    """Caché en memoria acotada: expira las entradas tras `ttl` segundos y descarta
+    la menos usada recientemente cuando se supera `max_entradas`."""
+
+    def __init__(self, max_entradas=1024, ttl=300):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.datos = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, clave, defecto=None):
+        with self.lock:
+            entrada = self.datos.get(clave)
+            if entrada is None:
+                return defecto
+            valor, expira = entrada
+            if expira < time.monotonic():
+                del self.datos[clave]
+                return defecto
+            self.datos.move_to_end(clave)
+            return valor
+
+    def set(self, clave, valor, ttl=None):
+        with self.lock:
+            self.datos[clave] = (valor, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self.datos.move_to_end(clave)
+            while len(self.datos) > self.max_entradas:
+                self.datos.popitem(last=False)
+
+    def agregar(self, clave, valor, ttl=None):
+        # Guarda solo si la clave no existe (o ya expiró); devuelve True si la guardó
+        with self.lock:
+            entrada = self.datos.get(clave)
+            if entrada is not None and entrada[1] >= time.monotonic():
+                return False
+            self.datos[clave] = (valor, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self.datos.move_to_end(clave)
+            while len(self.datos) > self.max_entradas:
+                self.datos.popitem(last=False)
+            return True
+
+    def delete(self, clave):
+        with self.lock:
+            self.datos.pop(clave, None)
+
+    def clear(self):
+        with self.lock:
+            self.datos.clear()
+
+    def __len__(self):
+        return len(self.datos)
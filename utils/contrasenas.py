@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturoTimeout
+
+import bcrypt
+
+from utils.metricas import registro, duracion_bcrypt, Medidor
+
+# Costo de bcrypt (log2 de las iteraciones). Al cambiarlo, las contraseñas se rehashean en el siguiente login
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+# Hilos dedicados a bcrypt; la librería libera el GIL mientras calcula el hash
+BCRYPT_WORKERS = int(os.getenv('BCRYPT_WORKERS', os.cpu_count() or 2))
+# Operaciones admitidas a la vez (en ejecución + en cola); por encima se rechaza de inmediato
+BCRYPT_MAX_PENDIENTES = int(os.getenv('BCRYPT_MAX_PENDIENTES', BCRYPT_WORKERS * 4))
+# Tiempo máximo que una petición espera su resultado, en segundos
+BCRYPT_TIMEOUT = float(os.getenv('BCRYPT_TIMEOUT', 5))
+
+class ServicioSaturado(Exception):
+    """El pool de bcrypt está lleno o no respondió a tiempo; la petición debe reintentarse más tarde."""
+
+class PoolContrasenas:
+    def __init__(self, workers, max_pendientes, rounds, timeout):
+        self.rounds = rounds
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self.cupos = threading.BoundedSemaphore(max_pendientes)
+        self.lock = threading.Lock()
+        self.pendientes = 0
+        self.rechazadas = 0
+        self.operaciones = 0
+        self.tiempo_total = 0.0
+        self.tiempo_maximo = 0.0
+
+    def ejecutar(self, fn, operacion, *args):
+        # Control de admisión: si no hay cupo se responde al instante en lugar de encolar sin límite
+        if not self.cupos.acquire(blocking=False):
+            with self.lock:
+                self.rechazadas += 1
+            raise ServicioSaturado()
+
+        with self.lock:
+            self.pendientes += 1
+        futuro = self.executor.submit(self.medir, fn, operacion, *args)
+        # El cupo se libera cuando termina la operación, aunque la petición haya dejado de esperar
+        futuro.add_done_callback(self.liberar)
+        try:
+            return futuro.result(timeout=self.timeout)
+        except FuturoTimeout:
+            with self.lock:
+                self.rechazadas += 1
+            raise ServicioSaturado()
+
+    def medir(self, fn, operacion, *args):
+        inicio = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            duracion = time.perf_counter() - inicio
+            duracion_bcrypt.observar(duracion, operacion)
+            with self.lock:
+                self.operaciones += 1
+                self.tiempo_total += duracion
+                self.tiempo_maximo = max(self.tiempo_maximo, duracion)
+
+    def liberar(self, futuro):
+        with self.lock:
+            self.pendientes -= 1
+        self.cupos.release()
+
+    def metricas(self):
+        with self.lock:
+            return {
+                "pendientes": self.pendientes,
+                "rechazadas": self.rechazadas,
+                "operaciones": self.operaciones,
+                "latencia_promedio_ms": round(self.tiempo_total / self.operaciones * 1000, 2) if self.operaciones else 0,
+                "latencia_maxima_ms": round(self.tiempo_maximo * 1000, 2),
+                "rounds": self.rounds,
+            }
+
+pool = PoolContrasenas(BCRYPT_WORKERS, BCRYPT_MAX_PENDIENTES, BCRYPT_ROUNDS, BCRYPT_TIMEOUT)
+
+registro.agregar(Medidor("bcrypt_pending", "Operaciones de bcrypt en ejecución o en cola", lambda: pool.pendientes))
+registro.agregar(Medidor("bcrypt_rejected_total", "Operaciones de bcrypt rechazadas por saturación", lambda: pool.rechazadas, tipo="counter"))
+
+def hashear_contrasena(password: str) -> str:
+    def hashear():
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=pool.rounds)).decode("utf-8")
+    return pool.ejecutar(hashear, "hash")
+
+def verificar_contrasena(password: str, hash_contrasena: str) -> bool:
+    return pool.ejecutar(bcrypt.checkpw, "verificacion", password.encode("utf-8"), hash_contrasena.encode("utf-8"))
+
+def necesita_rehash(hash_contrasena: str) -> bool:
+    # Formato bcrypt: $2b$<rounds>$<salt+hash>
+    try:
+        return int(hash_contrasena.split('$')[2]) != pool.rounds
+    except (AttributeError, IndexError, ValueError):
+        return True
@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+
+from utils.paginacion import paginar
+
+# Cantidad de filas que se traen de la base de datos en cada lote del cursor
+TAMANO_LOTE = 1000
+
+FORMATOS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+def serializar_valor(valor):
+    # Las fechas se exportan en formato ISO (YYYY-MM-DD)
+    if hasattr(valor, 'isoformat'):
+        return valor.isoformat()
+    return valor
+
+def generar_ndjson(filas):
+    """Genera una línea JSON por fila, sin acumular el resultado en memoria."""
+    for fila in filas:
+        yield json.dumps(fila, default=serializar_valor, ensure_ascii=False) + "\n"
+
+def generar_csv(filas, columnas):
+    """Genera el CSV fila por fila, empezando por la cabecera."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columnas, extrasaction='ignore')
+
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for fila in filas:
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerow({k: serializar_valor(v) for k, v in fila.items()})
+        yield buffer.getvalue()
+
+def iterar_por_lotes(query, columna_id, tamano_lote=TAMANO_LOTE):
+    """Recorre la consulta en lotes de `tamano_lote` con paginación por cursor sobre `columna_id`
+    (WHERE id > último ORDER BY id LIMIT n). Cada lote es una consulta aparte, así que la memoria no
+    crece con el total aunque el driver (mysql-connector) no tenga cursores del lado del servidor.
+    Las filas deben incluir la columna id."""
+    despues_de = None
+    while True:
+        filas, despues_de = paginar(query, columna_id, tamano_lote, despues_de)
+        yield from filas
+        if despues_de is None:
+            return
@@ -0,0 +1,26 @@
+from sqlalchemy import Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# Diferencia en días entre dos columnas o valores DATE, para usar dentro de sentencias SQL
+# (cada base de datos la escribe distinto).
+
+class dias_entre(FunctionElement):
+    """dias_entre(inicio, fin): días de `inicio` a `fin`."""
+    type = Integer()
+    inherit_cache = True
+
+@compiles(dias_entre)
+def _dias_entre(elemento, compilador, **kw):
+    inicio, fin = list(elemento.clauses)
+    return f"({compilador.process(fin, **kw)} - {compilador.process(inicio, **kw)})"
+
+@compiles(dias_entre, 'mysql')
+def _dias_entre_mysql(elemento, compilador, **kw):
+    inicio, fin = list(elemento.clauses)
+    return f"DATEDIFF({compilador.process(fin, **kw)}, {compilador.process(inicio, **kw)})"
+
+@compiles(dias_entre, 'sqlite')
+def _dias_entre_sqlite(elemento, compilador, **kw):
+    inicio, fin = list(elemento.clauses)
+    return f"CAST(julianday({compilador.process(fin, **kw)}) - julianday({compilador.process(inicio, **kw)}) AS INTEGER)"
@@ -0,0 +1,101 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+# Límite de peticiones con token bucket: cada cubeta admite una ráfaga de `capacidad` peticiones y se
+# repone de forma continua a razón de `tasa` peticiones por segundo. Las cubetas viven en memoria por
+# proceso o, con una URL de Redis, se comparten entre todos los procesos.
+
+CLAVES = ('identidad', 'rol', 'ip')
+
+class Limite:
+    """`peticiones` cada `segundos`, contadas por usuario del token ('identidad'), por rol (una cubeta
+    compartida por todos los usuarios del rol) o por IP del cliente."""
+
+    def __init__(self, peticiones, segundos, por='identidad'):
+        if por not in CLAVES:
+            raise ValueError(f"Clave de límite desconocida: {por}")
+        self.capacidad = peticiones
+        self.segundos = segundos
+        self.tasa = peticiones / segundos
+        self.por = por
+
+    def espera(self, tokens):
+        """Segundos hasta que vuelva a haber un token disponible."""
+        return max(1, math.ceil((1 - tokens) / self.tasa))
+
+    def encabezados(self, tokens):
+        return {
+            "RateLimit-Limit": str(self.capacidad),
+            "RateLimit-Remaining": str(int(tokens)),
+            # Segundos hasta que la cubeta vuelva a estar llena
+            "RateLimit-Reset": str(math.ceil((self.capacidad - tokens) / self.tasa)),
+            "RateLimit-Policy": f"{self.capacidad};w={self.segundos}",
+        }
+
+class AlmacenCubetas:
+    """Cubetas en memoria, acotadas a `max_entradas` (se descartan las menos usadas recientemente)."""
+
+    def __init__(self, max_entradas=10000):
+        self.max_entradas = max_entradas
+        self.cubetas = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consumir(self, clave, capacidad, tasa):
+        """Toma un token de la cubeta. Devuelve (permitido, tokens que quedan)."""
+        ahora = time.monotonic()
+        with self.lock:
+            tokens, ultimo = self.cubetas.get(clave, (capacidad, ahora))
+            tokens = min(capacidad, tokens + (ahora - ultimo) * tasa)
+            permitido = tokens >= 1
+            if permitido:
+                tokens -= 1
+            self.cubetas[clave] = (tokens, ahora)
+            self.cubetas.move_to_end(clave)
+            while len(self.cubetas) > self.max_entradas:
+                self.cubetas.popitem(last=False)
+        return permitido, tokens
+
+# Se ejecuta de forma atómica en Redis. Usa el reloj de Redis para que todos los procesos coincidan,
+# y la cubeta expira sola cuando ya estaría llena de nuevo.
+_SCRIPT_CONSUMIR = """
+local capacidad = tonumber(ARGV[1])
+local tasa = tonumber(ARGV[2])
+local reloj = redis.call('TIME')
+local ahora = tonumber(reloj[1]) + tonumber(reloj[2]) / 1000000
+local datos = redis.call('HMGET', KEYS[1], 'tokens', 'ultimo')
+local tokens = tonumber(datos[1]) or capacidad
+local ultimo = tonumber(datos[2]) or ahora
+tokens = math.min(capacidad, tokens + math.max(0, ahora - ultimo) * tasa)
+local permitido = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    permitido = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ultimo', tostring(ahora))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacidad / tasa) + 1)
+return {permitido, tostring(tokens)}
+"""
+
+class AlmacenCubetasRedis:
+    """Cubetas compartidas entre procesos. Requiere el paquete opcional `redis`."""
+
+    def __init__(self, url, prefijo='limites:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("Para usar CACHE_REDIS_URL se debe instalar el paquete 'redis'")
+        self.cliente = redis.Redis.from_url(url)
+        self.prefijo = prefijo
+        self.script = self.cliente.register_script(_SCRIPT_CONSUMIR)
+
+    def consumir(self, clave, capacidad, tasa):
+        permitido, tokens = self.script(keys=[self.prefijo + clave], args=[capacidad, tasa])
+        return bool(permitido), float(tokens)
+
+def crear_almacen_cubetas(redis_url=None, max_entradas=10000):
+    # En memoria por defecto; con una URL de Redis los límites se comparten entre procesos
+    if redis_url:
+        return AlmacenCubetasRedis(redis_url)
+    return AlmacenCubetas(max_entradas=max_entradas)
@@ -0,0 +1,156 @@
+import bisect
+import threading
+import time
+
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Métricas en memoria del proceso, expuestas en formato de texto de Prometheus.
+# Con varios workers de gunicorn cada proceso publica sus propios valores; Prometheus los
+# distingue por la instancia que se consulta.
+
+BUCKETS_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS_CANTIDAD = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+BUCKETS_BYTES = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+def formatear_etiquetas(nombres, valores, extra=None):
+    pares = list(zip(nombres, valores))
+    if extra:
+        pares.append(extra)
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in pares) + "}"
+
+class Contador:
+    tipo = "counter"
+
+    def __init__(self, nombre, ayuda, etiquetas=()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = etiquetas
+        self.valores = {}
+        self.lock = threading.Lock()
+
+    def incrementar(self, *valores_etiquetas, cantidad=1):
+        with self.lock:
+            self.valores[valores_etiquetas] = self.valores.get(valores_etiquetas, 0) + cantidad
+
+    def exportar(self):
+        with self.lock:
+            return [f"{self.nombre}{formatear_etiquetas(self.etiquetas, k)} {v}" for k, v in self.valores.items()]
+
+class Medidor:
+    """Valor calculado al momento de exportar a partir de un estado que ya existe
+    (por ejemplo, la cola de bcrypt). Con tipo="counter" publica un contador acumulado."""
+
+    def __init__(self, nombre, ayuda, funcion, tipo="gauge"):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.funcion = funcion
+        self.tipo = tipo
+
+    def exportar(self):
+        return [f"{self.nombre} {self.funcion()}"]
+
+class Histograma:
+    tipo = "histogram"
+
+    def __init__(self, nombre, ayuda, etiquetas=(), buckets=BUCKETS_LATENCIA):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = etiquetas
+        self.buckets = tuple(buckets)
+        # etiquetas -> [conteo por bucket..., +Inf], suma
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observar(self, valor, *valores_etiquetas):
+        indice = bisect.bisect_left(self.buckets, valor)
+        with self.lock:
+            serie = self.series.get(valores_etiquetas)
+            if serie is None:
+                serie = self.series[valores_etiquetas] = [[0] * (len(self.buckets) + 1), 0.0]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    def exportar(self):
+        lineas = []
+        with self.lock:
+            for valores, (conteos, suma) in self.series.items():
+                acumulado = 0
+                for limite, conteo in zip(self.buckets + ("+Inf",), conteos):
+                    acumulado += conteo
+                    lineas.append(f"{self.nombre}_bucket{formatear_etiquetas(self.etiquetas, valores, ('le', limite))} {acumulado}")
+                lineas.append(f"{self.nombre}_sum{formatear_etiquetas(self.etiquetas, valores)} {suma}")
+                lineas.append(f"{self.nombre}_count{formatear_etiquetas(self.etiquetas, valores)} {acumulado}")
+        return lineas
+
+class Registro:
+    def __init__(self):
+        self.metricas = []
+
+    def agregar(self, metrica):
+        self.metricas.append(metrica)
+        return metrica
+
+    def exportar(self):
+        lineas = []
+        for metrica in self.metricas:
+            lineas.append(f"# HELP {metrica.nombre} {metrica.ayuda}")
+            lineas.append(f"# TYPE {metrica.nombre} {metrica.tipo}")
+            lineas.extend(metrica.exportar())
+        return "\n".join(lineas) + "\n"
+
+registro = Registro()
+
+duracion_peticion = registro.agregar(Histograma(
+    "http_request_duration_seconds", "Duración de las peticiones HTTP por endpoint", ("endpoint", "method", "status")))
+tamano_respuesta = registro.agregar(Histograma(
+    "http_response_size_bytes", "Tamaño del cuerpo de las respuestas por endpoint", ("endpoint",), BUCKETS_BYTES))
+sentencias_peticion = registro.agregar(Histograma(
+    "db_statements_per_request", "Sentencias SQL ejecutadas por petición", ("endpoint",), BUCKETS_CANTIDAD))
+tiempo_db_peticion = registro.agregar(Histograma(
+    "db_time_per_request_seconds", "Tiempo total en la base de datos por petición", ("endpoint",)))
+duracion_autenticacion = registro.agregar(Histograma(
+    "auth_duration_seconds", "Tiempo de role_required (verificación del token y resolución del usuario)", ("endpoint",)))
+duracion_bcrypt = registro.agregar(Histograma(
+    "bcrypt_duration_seconds", "Duración de cada hash o verificación de bcrypt", ("operacion",)))
+peticiones_lentas = registro.agregar(Contador(
+    "http_slow_requests_total", "Peticiones que superaron SLOW_REQUEST_MS", ("endpoint",)))
+idempotencia = registro.agregar(Contador(
+    "idempotency_requests_total", "Peticiones con Idempotency-Key por resultado", ("endpoint", "resultado")))
+peticiones_limitadas = registro.agregar(Contador(
+    "http_throttled_requests_total", "Peticiones rechazadas con 429 por el límite de peticiones", ("endpoint", "por")))
+lecturas_enrutadas = registro.agregar(Contador(
+    "db_read_routing_total", "Peticiones de solo lectura por base elegida (replica, principal_reciente, principal_sin_replicas)", ("destino",)))
+
+# --- Medición de SQL por petición ---
+# Los contadores viven en flask.g, así que solo se cuentan las sentencias ejecutadas dentro de una petición.
+
+MAX_SENTENCIAS_REGISTRADAS = 20
+
+def iniciar_medicion_sql(registrar_sentencias=False):
+    g.sql_sentencias = 0
+    g.sql_tiempo = 0.0
+    g.sql_detalle = [] if registrar_sentencias else None
+
+# El inicio se guarda en el contexto de ejecución, que se descarta con la sentencia: si falla y no llega
+# after_cursor_execute, no queda nada pendiente en la conexión del pool
+@event.listens_for(Engine, "before_cursor_execute")
+def antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.inicio_sentencia = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    inicio = getattr(context, "inicio_sentencia", None)
+    if inicio is None:
+        return
+    duracion = time.perf_counter() - inicio
+    if not has_request_context() or "sql_sentencias" not in g:
+        return
+    g.sql_sentencias += 1
+    g.sql_tiempo += duracion
+    if g.sql_detalle is not None and len(g.sql_detalle) < MAX_SENTENCIAS_REGISTRADAS:
+        g.sql_detalle.append((round(duracion * 1000, 2), statement))
@@ -0,0 +1,86 @@
+import operator
+from datetime import datetime
+
+# Límite máximo de elementos por página, para que ningún cliente pueda pedir la tabla completa
+LIMITE_MAXIMO = 500
+
+# Operadores disponibles para los filtros de los listados
+IGUAL = operator.eq
+DESDE = operator.ge
+HASTA = operator.le
+
+def convertir_entero(valor, campo):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"El parámetro '{campo}' debe ser un número entero")
+
+def convertir_fecha(valor, campo):
+    try:
+        return datetime.strptime(valor, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ValueError(f"El parámetro '{campo}' debe tener formato YYYY-MM-DD")
+
+def convertir_enum(enum_cls):
+    # Acepta el nombre del valor (ej. 'Pendiente') o su número (ej. '1'), igual que los endpoints POST/PUT
+    def convertir(valor, campo):
+        if valor.isdigit():
+            try:
+                return enum_cls(int(valor))
+            except ValueError:
+                pass
+        elif valor in enum_cls.__members__:
+            return enum_cls[valor]
+        raise ValueError(f"El {campo} '{valor}' no es válido")
+    return convertir
+
+def aplicar_filtros(query, args, filtros):
+    """Aplica a la consulta los filtros presentes en los parámetros de la petición.
+
+    `filtros` relaciona el nombre del parámetro con una tupla (columna, conversor, operador).
+    Lanza ValueError con un mensaje para el cliente si algún valor no es válido.
+    """
+    for nombre, (columna, conversor, operador) in filtros.items():
+        valor = args.get(nombre)
+        if valor is None or valor == '':
+            continue
+        query = query.filter(operador(columna, conversor(valor, nombre)))
+    return query
+
+def leer_paginacion(args, limite_maximo=LIMITE_MAXIMO):
+    """Devuelve (limit, after) a partir de los parámetros de la petición.
+
+    Si el cliente no envía ni 'limit' ni 'after' devuelve (None, None), lo que indica
+    que se debe responder con el formato de lista original (compatibilidad).
+    """
+    if 'limit' not in args and 'after' not in args:
+        return None, None
+
+    limit = limite_maximo
+    if args.get('limit'):
+        limit = convertir_entero(args['limit'], 'limit')
+        if limit < 1:
+            raise ValueError("El parámetro 'limit' debe ser mayor que cero")
+        limit = min(limit, limite_maximo)
+
+    after = None
+    if args.get('after'):
+        after = convertir_entero(args['after'], 'after')
+
+    return limit, after
+
+def paginar(query, columna_id, limit, after=None):
+    """Paginación por cursor (keyset) sobre la columna id.
+
+    Devuelve (elementos, next_cursor). Se pide un elemento de más para saber si hay
+    otra página sin necesidad de un COUNT(*).
+    """
+    if after is not None:
+        query = query.filter(columna_id > after)
+    elementos = query.order_by(columna_id).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(elementos) > limit:
+        elementos = elementos[:limit]
+        next_cursor = elementos[-1].id
+    return elementos, next_cursor
@@ -0,0 +1,68 @@
+import itertools
+import logging
+import threading
+import time
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Selección de réplicas de lectura: reparte las lecturas en round-robin entre las réplicas sanas.
+# La salud de cada réplica se comprueba con un SELECT 1 como máximo una vez cada `intervalo` segundos
+# por proceso; si ninguna responde, elegir() devuelve None y la lectura va a la base principal.
+
+def comprobar_motor(motor):
+    try:
+        with motor.connect() as conexion:
+            conexion.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+class EstadoReplica:
+    def __init__(self, nombre, motor):
+        self.nombre = nombre
+        self.motor = motor
+        self.sana = True
+        self.proxima_comprobacion = 0.0
+        self.lock = threading.Lock()
+
+class EnrutadorReplicas:
+    def __init__(self, replicas, intervalo=5, comprobar=comprobar_motor):
+        """`replicas` es una lista de (nombre, motor)."""
+        self.replicas = [EstadoReplica(nombre, motor) for nombre, motor in replicas]
+        self.intervalo = intervalo
+        self.comprobar = comprobar
+        self._turno = itertools.count()
+
+    def __len__(self):
+        return len(self.replicas)
+
+    def elegir(self):
+        """Devuelve el motor de la siguiente réplica sana, o None si no hay ninguna."""
+        cantidad = len(self.replicas)
+        if not cantidad:
+            return None
+        inicio = next(self._turno)
+        for desplazamiento in range(cantidad):
+            replica = self.replicas[(inicio + desplazamiento) % cantidad]
+            if self.disponible(replica):
+                return replica.motor
+        return None
+
+    def disponible(self, replica):
+        ahora = time.monotonic()
+        # Solo un hilo comprueba la réplica; los demás usan el último resultado mientras tanto
+        if ahora >= replica.proxima_comprobacion and replica.lock.acquire(blocking=False):
+            try:
+                if ahora >= replica.proxima_comprobacion:
+                    sana = self.comprobar(replica.motor)
+                    if sana != replica.sana:
+                        logger.warning("Réplica %s %s", replica.nombre, "recuperada" if sana else "sin respuesta, se lee de la principal")
+                    replica.sana = sana
+                    replica.proxima_comprobacion = time.monotonic() + self.intervalo
+            finally:
+                replica.lock.release()
+        return replica.sana
+
+    def estado(self):
+        return {replica.nombre: replica.sana for replica in self.replicas}
@@ -0,0 +1,48 @@
+from enum import Enum
+
+from sqlalchemy import func, select, literal
+
+# Contadores del resumen de estados: una fila por (entidad, estado, id_usuario, mes) con su cantidad.
+# Se mantienen en la misma transacción que cada alta, cambio o baja, y se pueden reconstruir desde cero.
+
+def nombre_estado(valor):
+    # El estado puede llegar como miembro del Enum o como su nombre (los endpoints asignan .name)
+    return valor.name if isinstance(valor, Enum) else valor
+
+def clave_mes(fecha):
+    return fecha.strftime('%Y-%m')
+
+def upsert_contadores(conexion, tabla, deltas):
+    """Suma cada delta a su contador, creándolo si no existe. `deltas`: {(entidad, estado, id_usuario, mes): delta}."""
+    # Siempre en el mismo orden de clave: dos transacciones que tocan los mismos contadores los
+    # bloquean en el mismo orden y no se interbloquean
+    filas = [{"entidad": k[0], "estado": k[1], "id_usuario": k[2], "mes": k[3], "cantidad": d}
+             for k, d in sorted(deltas.items()) if d]
+    if not filas:
+        return
+    if conexion.dialect.name == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        sentencia = insert(tabla)
+        sentencia = sentencia.on_duplicate_key_update(cantidad=tabla.c.cantidad + sentencia.inserted.cantidad)
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+        sentencia = insert(tabla)
+        sentencia = sentencia.on_conflict_do_update(
+            index_elements=['entidad', 'estado', 'id_usuario', 'mes'],
+            set_={"cantidad": tabla.c.cantidad + sentencia.excluded.cantidad})
+    conexion.execute(sentencia, filas)
+
+def expresion_mes(conexion, columna):
+    if conexion.dialect.name == 'mysql':
+        return func.date_format(columna, '%Y-%m')
+    return func.strftime('%Y-%m', columna)
+
+def reconstruir(conexion, tabla, origenes):
+    """Recalcula todos los contadores con un GROUP BY sobre las tablas de origen.
+    `origenes`: {entidad: tabla de origen}. Debe ejecutarse dentro de una transacción."""
+    conexion.execute(tabla.delete())
+    for entidad, origen in origenes.items():
+        mes = expresion_mes(conexion, origen.c.fecha_creacion)
+        consulta = select(literal(entidad), origen.c.estado, origen.c.id_usuario, mes, func.count()) \
+            .group_by(origen.c.estado, origen.c.id_usuario, mes)
+        conexion.execute(tabla.insert().from_select(['entidad', 'estado', 'id_usuario', 'mes', 'cantidad'], consulta))
@@ -0,0 +1,150 @@
+import re
+from datetime import date
+
+# Validación declarativa de los cuerpos JSON. Cada esquema se arma una sola vez al importar el módulo
+# que lo declara: los patrones quedan compilados y los enums convertidos en tablas de búsqueda, así
+# que validar una petición es recorrer una lista de funciones ya preparadas.
+
+PATRON_CORREO = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+PATRON_URL = re.compile(r"^(https?://)?([\w\-]+\.)+[\w\-]+(/[^\sß]*)?$")
+_PATRON_FECHA = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+
+class Invalido(Exception):
+    """Error de un campo; el mensaje se devuelve tal cual al cliente."""
+
+class Campo:
+    """Campo de un esquema. Las subclases implementan convertir(nombre, valor), que devuelve el valor
+    ya convertido o lanza Invalido. Un valor vacío (None, '', 0, [] ...) cuenta como ausente, igual
+    que en las validaciones originales con `not data.get(campo)`."""
+
+    def __init__(self, obligatorio=True, defecto=None):
+        self.obligatorio = obligatorio
+        self.defecto = defecto
+
+    def convertir(self, nombre, valor):
+        return valor
+
+class Texto(Campo):
+    def __init__(self, max_longitud=None, patron=None, mensaje=None, admite_numero=False, **kwargs):
+        super().__init__(**kwargs)
+        self.max_longitud = max_longitud
+        self.patron = patron
+        self.mensaje = mensaje
+        self.admite_numero = admite_numero
+
+    def convertir(self, nombre, valor):
+        if self.admite_numero and isinstance(valor, int) and not isinstance(valor, bool):
+            valor = str(valor)
+        if not isinstance(valor, str):
+            raise Invalido(f"El campo '{nombre}' debe ser texto")
+        if self.max_longitud is not None and len(valor) > self.max_longitud:
+            raise Invalido(f"El campo '{nombre}' admite como máximo {self.max_longitud} caracteres")
+        if self.patron is not None and not self.patron.match(valor):
+            raise Invalido(self.mensaje or f"El campo '{nombre}' no tiene un formato válido")
+        return valor
+
+class Entero(Campo):
+    def convertir(self, nombre, valor):
+        if isinstance(valor, bool):
+            raise Invalido(f"El campo '{nombre}' debe ser un número entero")
+        if isinstance(valor, int):
+            return valor
+        if isinstance(valor, str) and valor.isdigit():
+            return int(valor)
+        raise Invalido(f"El campo '{nombre}' debe ser un número entero")
+
+class Fecha(Campo):
+    """Fecha en formato YYYY-MM-DD."""
+
+    def convertir(self, nombre, valor):
+        coincidencia = _PATRON_FECHA.match(valor) if isinstance(valor, str) else None
+        try:
+            if coincidencia is None:
+                raise ValueError
+            return date(*map(int, coincidencia.groups()))
+        except ValueError:
+            raise Invalido(f"El campo '{nombre}' debe tener formato YYYY-MM-DD")
+
+class Opcion(Campo):
+    """Miembro de un Enum, por nombre (ej. 'Pendiente') o por número (ej. 1)."""
+
+    def __init__(self, enum_cls, etiqueta=None, **kwargs):
+        super().__init__(**kwargs)
+        self.etiqueta = etiqueta
+        self.tabla = {miembro.name: miembro for miembro in enum_cls}
+        self.tabla.update({miembro.value: miembro for miembro in enum_cls})
+
+    def convertir(self, nombre, valor):
+        miembro = None if isinstance(valor, bool) else self.tabla.get(valor) if isinstance(valor, (str, int)) else None
+        if miembro is None:
+            raise Invalido(f"El {self.etiqueta or nombre} '{valor}' no es válido")
+        return miembro
+
+class Regla:
+    """Validación entre campos: `funcion(campos)` devuelve un mensaje de error o None. Solo se evalúa
+    si todos los campos de `depende_de` llegaron y son válidos; el error se asigna a `campo`."""
+
+    def __init__(self, depende_de, funcion, campo=None):
+        self.depende_de = tuple(depende_de)
+        self.funcion = funcion
+        self.campo = campo or self.depende_de[-1]
+
+class Esquema:
+    """Conjunto de campos y reglas de un cuerpo JSON.
+
+    - parcial: los campos ausentes se omiten (PUT/PATCH); los enviados se validan igual, y enviar
+      uno vacío es un error, como en los PUT originales.
+    - estricto: los campos no declarados son un error en lugar de ignorarse.
+
+    validar(data) devuelve (campos, errores): los valores convertidos y un diccionario campo -> mensaje
+    con todos los errores encontrados (vacío si el cuerpo es válido).
+    """
+
+    def __init__(self, campos, reglas=(), parcial=False, estricto=False):
+        self.campos = [(nombre, campo, campo.convertir) for nombre, campo in campos.items()]
+        self.nombres = frozenset(campos)
+        self.reglas = tuple(reglas)
+        self.parcial = parcial
+        self.estricto = estricto
+
+    def validar(self, data):
+        if not isinstance(data, dict):
+            return None, {"cuerpo": "Se esperaba un objeto JSON"}
+
+        campos = {}
+        errores = {}
+        if self.estricto:
+            for nombre in data:
+                if nombre not in self.nombres:
+                    errores[nombre] = f"El campo '{nombre}' no se puede modificar"
+
+        for nombre, campo, convertir in self.campos:
+            valor = data.get(nombre)
+            if not valor:
+                if self.parcial:
+                    if nombre in data:
+                        errores[nombre] = f"El campo '{nombre}' es obligatorio"
+                elif campo.obligatorio:
+                    errores[nombre] = f"El campo '{nombre}' es obligatorio"
+                elif campo.defecto is not None:
+                    campos[nombre] = campo.defecto
+                continue
+            try:
+                campos[nombre] = convertir(nombre, valor)
+            except Invalido as e:
+                errores[nombre] = str(e)
+
+        for regla in self.reglas:
+            if regla.campo in errores or not all(c in campos for c in regla.depende_de):
+                continue
+            mensaje = regla.funcion(campos)
+            if mensaje:
+                errores[regla.campo] = mensaje
+
+        if errores:
+            return None, errores
+        return campos, errores
+
+def mensaje_errores(errores):
+    """Todos los errores en una sola línea, para el campo 'error' de las respuestas."""
+    return "; ".join(errores.values())